@@ -0,0 +1,249 @@
+// Frame-time benchmark for the dense rendering path.
+//
+// Runs in plain Node with no browser: the canvas is replaced by a stub that
+// implements the CanvasRenderingContext2D calls made by drawDensePlot and
+// counts them. The numbers therefore cover the JavaScript side of a frame
+// (scaling, path building, label selection, legend windowing) but not
+// rasterisation, which the browser does off the main thread for a single
+// canvas anyway.
+//
+// For comparison, the "apex js" column times the per-series JavaScript the
+// ApexCharts path runs on every tick in view-src/index.html: building the
+// updateOptions payload, the deep copy ApexCharts makes of the new series,
+// and calling the legend and data-label formatters for every series. It
+// leaves out SVG construction, layout and paint, which is where most of
+// that path's time goes in a browser, so it is a lower bound. The
+// DENSE_SERIES_THRESHOLD of 150 is a judgement call informed by this
+// lower bound and by observed stutter, not a measured crossover point.
+//
+// Usage: pnpm run bench [-- --frames 200 --counts 50,100,400]
+
+import {
+  DENSE_SERIES_THRESHOLD,
+  LEGEND_ROW_HEIGHT,
+  createFrameScheduler,
+  drawDensePlot,
+  legendEntry,
+  visibleLegendRange,
+} from "../dense.mjs";
+
+const FRAME_BUDGET_MS = 1000 / 60;
+const WIDTH = 1200;
+const HEIGHT = 600;
+const MAX_CHANNEL_5 = 170;
+const WIDTHS = [20, 40, 80, 160];
+
+function parseArgs(argv) {
+  const args = { frames: 200, counts: [25, 50, 100, 150, 200, 400, 800, 1600, 3200] };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === "--frames") args.frames = Number(argv[++i]);
+    else if (argv[i] === "--counts") args.counts = argv[++i].split(",").map(Number);
+  }
+  return args;
+}
+
+// Deterministic PRNG so runs are comparable.
+function mulberry32(seed) {
+  return () => {
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// Same shape as tiny_wifi_analyzer.series.to_series output.
+function makeSeries(count, rand) {
+  const series = [];
+  for (let i = 0; i < count; i++) {
+    const center = 1 + Math.floor(rand() * MAX_CHANNEL_5);
+    const half = WIDTHS[Math.floor(rand() * WIDTHS.length)] / 10;
+    const rssi = -30 - Math.floor(rand() * 65);
+    const hex = i.toString(16).padStart(6, "0");
+    series.push({
+      name: `aa:bb:cc:${hex.slice(0, 2)}:${hex.slice(2, 4)}:${hex.slice(4, 6)}`,
+      ssid: rand() < 0.1 ? null : `network-${i}`,
+      data: [
+        [Math.max(1, center - half), -100],
+        [center, rssi],
+        [Math.min(MAX_CHANNEL_5, center + half), -100],
+      ],
+    });
+  }
+  return series;
+}
+
+function makeStubContext() {
+  const ctx = { calls: 0 };
+  const methods = [
+    "beginPath", "closePath", "moveTo", "lineTo", "rect", "clip", "fill",
+    "stroke", "fillText", "clearRect", "save", "restore", "translate",
+    "rotate", "setTransform",
+  ];
+  for (const name of methods) {
+    ctx[name] = () => {
+      ctx.calls++;
+    };
+  }
+  return ctx;
+}
+
+// Formatters copied from makeOptions() in view-src/index.html.
+function makeApexFormatters(rawSeries) {
+  return {
+    legend: (seriesName, { seriesIndex, w }) => {
+      const yValue = w.config.series[seriesIndex].data[1][1];
+      const xValue = w.config.series[seriesIndex].data[1][0];
+      let ssid = rawSeries[seriesIndex].ssid;
+      if (ssid === null) ssid = "n/a";
+      const bssid = rawSeries[seriesIndex].name;
+      return [
+        `Channel: ${xValue} RSSI: ${yValue}dBm`,
+        "<br>",
+        ssid != "n/a" ? `<b>${ssid}</b>` : `<b style="color:#888;">${ssid}</b>`,
+        "<br>",
+        `<span style="font-size:0.9em;color:#888;">${bssid}</span>`,
+      ];
+    },
+    dataLabel: (val, { seriesIndex, w }) => {
+      if (val === -100) return "";
+      const ssid = rawSeries[seriesIndex].ssid;
+      const ch = w.config.series[seriesIndex].data[1][0];
+      if (ssid === null) return `${ch} n/a`;
+      return `${ch} ${ssid}`;
+    },
+  };
+}
+
+// JavaScript-only share of one ApexCharts update (see header comment).
+function apexTick(series) {
+  const payload = { series, xaxis: { min: 1, max: MAX_CHANNEL_5 } };
+  const w = { config: { series: structuredClone(payload.series), xaxis: { ...payload.xaxis } } };
+  const formatters = makeApexFormatters(series);
+  let sink = 0;
+  for (let i = 0; i < w.config.series.length; i++) {
+    sink += formatters.legend(w.config.series[i].name, { seriesIndex: i, w }).join("").length;
+    for (const [, rssi] of w.config.series[i].data) {
+      sink += formatters.dataLabel(rssi, { seriesIndex: i, w }).length;
+    }
+  }
+  return sink;
+}
+
+function percentile(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+function benchFrameTime(count, frames) {
+  const rand = mulberry32(count);
+  const ctx = makeStubContext();
+  const viewport = HEIGHT;
+  const samples = [];
+  const apexSamples = [];
+  let sink = 0;
+
+  // Rotate through several scans so each frame sees different data, like a
+  // real scan tick, without timing the data generation itself.
+  const ticks = Array.from({ length: Math.min(frames, 20) }, () => makeSeries(count, rand));
+
+  for (let f = 0; f < frames + 10; f++) {
+    const series = ticks[f % ticks.length];
+    const start = performance.now();
+    drawDensePlot(ctx, series, {
+      width: WIDTH,
+      height: HEIGHT,
+      minChannel: 1,
+      maxChannel: MAX_CHANNEL_5,
+      title: "5GHz",
+      dark: false,
+    });
+    const scrollTop = ((f * 7) % Math.max(1, count)) * LEGEND_ROW_HEIGHT;
+    const range = visibleLegendRange(scrollTop, viewport, LEGEND_ROW_HEIGHT, count);
+    for (let i = range.start; i < range.end; i++) {
+      sink += legendEntry(series[i]).summary.length;
+    }
+    const elapsed = performance.now() - start;
+
+    const apexStart = performance.now();
+    sink += apexTick(series);
+    const apexElapsed = performance.now() - apexStart;
+
+    if (f >= 10) {
+      // first frames are JIT warm-up
+      samples.push(elapsed);
+      apexSamples.push(apexElapsed);
+    }
+  }
+
+  samples.sort((a, b) => a - b);
+  apexSamples.sort((a, b) => a - b);
+  return {
+    count,
+    mean: samples.reduce((a, b) => a + b, 0) / samples.length,
+    p50: percentile(samples, 0.5),
+    p95: percentile(samples, 0.95),
+    max: samples[samples.length - 1],
+    callsPerFrame: Math.round(ctx.calls / (frames + 10)),
+    apexP50: percentile(apexSamples, 0.5),
+    sink,
+  };
+}
+
+// Feed updates faster than a 60 Hz display and count how many draws the
+// scheduler actually lets through.
+function benchCoalescing(updateIntervalMs, durationMs) {
+  let queued = null;
+  let draws = 0;
+  const scheduler = createFrameScheduler(
+    () => {
+      draws++;
+    },
+    (cb) => {
+      queued = cb;
+    },
+  );
+  let nextFrame = FRAME_BUDGET_MS;
+  let updates = 0;
+  for (let now = 0; now < durationMs; now += updateIntervalMs) {
+    for (; nextFrame <= now; nextFrame += FRAME_BUDGET_MS) {
+      if (queued) {
+        const cb = queued;
+        queued = null;
+        cb(nextFrame);
+      }
+    }
+    scheduler.schedule("5", updates++);
+  }
+  if (queued) queued(nextFrame);
+  return { updates, draws };
+}
+
+function fmt(ms) {
+  return ms.toFixed(3).padStart(8);
+}
+
+function main() {
+  const { frames, counts } = parseArgs(process.argv.slice(2));
+
+  console.log(`Dense render frame time (${frames} frames, ${WIDTH}x${HEIGHT}, stub canvas)`);
+  console.log(`Dense mode engages above ${DENSE_SERIES_THRESHOLD} series; budget ${FRAME_BUDGET_MS.toFixed(1)} ms/frame\n`);
+  console.log("  series      mean       p50       p95       max   ctx calls  budget   apex js p50");
+  for (const count of counts) {
+    const r = benchFrameTime(count, frames);
+    const ok = r.p95 <= FRAME_BUDGET_MS ? "ok" : "OVER";
+    console.log(
+      `${String(r.count).padStart(8)}  ${fmt(r.mean)}  ${fmt(r.p50)}  ${fmt(r.p95)}  ${fmt(r.max)}  ${String(r.callsPerFrame).padStart(10)}  ${ok.padEnd(6)}  ${fmt(r.apexP50)}`,
+    );
+  }
+
+  console.log("\napex js: per-tick ApexCharts payload + formatters only; excludes SVG/DOM work (lower bound)");
+
+  console.log("\nrequestAnimationFrame coalescing (1 s at 60 Hz)");
+  console.log("  update every   updates   draws");
+  for (const interval of [1, 5, 10, 16, 50, 300]) {
+    const r = benchCoalescing(interval, 1000);
+    console.log(`${String(interval).padStart(11)} ms  ${String(r.updates).padStart(8)}  ${String(r.draws).padStart(6)}`);
+  }
+}
+
+main();
@@ -0,0 +1,499 @@
+// High-density rendering path.
+//
+// ApexCharts draws one SVG path (plus a legend entry and a data label) per
+// series, and every update rebuilds all of them. That is fine for a handful
+// of networks but stutters once a band has a few hundred BSSIDs. Above
+// DENSE_SERIES_THRESHOLD the band is drawn here instead: all triangles go
+// onto a single canvas, the legend only materialises the rows in view, and
+// updates are coalesced to at most one draw per animation frame.
+//
+// Everything that does not need the DOM is exported separately so it can be
+// exercised from Node (see bench/dense-bench.mjs).
+
+export const DENSE_SERIES_THRESHOLD = 150;
+
+// Leave dense mode only once the count drops well below the threshold so a
+// band hovering around it does not flip between renderers every tick.
+export const DENSE_SERIES_HYSTERESIS = 0.8;
+
+// ApexCharts "palette1", so colours match the regular chart.
+export const PALETTE = ["#008FFB", "#00E396", "#FEB019", "#FF4560", "#775DD0"];
+
+export const LEGEND_ROW_HEIGHT = 48;
+export const LEGEND_OVERSCAN = 4;
+
+// Only the strongest networks get a text label at their apex; labelling
+// hundreds of overlapping triangles is unreadable anyway.
+export const MAX_APEX_LABELS = 20;
+
+const RSSI_MIN = -100;
+const RSSI_MAX = 0;
+const PADDING = { top: 36, right: 16, bottom: 44, left: 52 };
+
+export function shouldUseDense(count, currentlyDense) {
+  if (currentlyDense) {
+    return count >= DENSE_SERIES_THRESHOLD * DENSE_SERIES_HYSTERESIS;
+  }
+  return count > DENSE_SERIES_THRESHOLD;
+}
+
+export function seriesColor(index) {
+  return PALETTE[index % PALETTE.length];
+}
+
+export function getDenseTheme(dark) {
+  return dark
+    ? { text: "#e0e0e0", grid: "#3a3a3a", axis: "#777", fillAlpha: 0.25 }
+    : { text: "#373d3f", grid: "#e0e0e0", axis: "#78909c", fillAlpha: 0.35 };
+}
+
+export function makeScale(width, height, minChannel, maxChannel) {
+  const plotLeft = PADDING.left;
+  const plotTop = PADDING.top;
+  const plotWidth = Math.max(1, width - PADDING.left - PADDING.right);
+  const plotHeight = Math.max(1, height - PADDING.top - PADDING.bottom);
+  const xRange = Math.max(1, maxChannel - minChannel);
+  return {
+    plotLeft,
+    plotTop,
+    plotWidth,
+    plotHeight,
+    minChannel,
+    maxChannel,
+    x: (channel) => plotLeft + ((channel - minChannel) / xRange) * plotWidth,
+    y: (rssi) => plotTop + ((RSSI_MAX - rssi) / (RSSI_MAX - RSSI_MIN)) * plotHeight,
+  };
+}
+
+function channelTicks(minChannel, maxChannel) {
+  const count = maxChannel - minChannel;
+  const step = Math.max(1, Math.ceil(count / 15));
+  const ticks = [];
+  for (let ch = minChannel; ch <= maxChannel; ch += step) {
+    ticks.push(ch);
+  }
+  return ticks;
+}
+
+function drawAxes(ctx, scale, theme, title) {
+  const { plotLeft, plotTop, plotWidth, plotHeight } = scale;
+  const plotBottom = plotTop + plotHeight;
+
+  ctx.lineWidth = 1;
+  ctx.strokeStyle = theme.grid;
+  ctx.fillStyle = theme.text;
+  ctx.font = "11px ui-sans-serif, system-ui, sans-serif";
+
+  ctx.beginPath();
+  ctx.textAlign = "center";
+  ctx.textBaseline = "top";
+  for (const ch of channelTicks(scale.minChannel, scale.maxChannel)) {
+    const x = Math.round(scale.x(ch)) + 0.5;
+    ctx.moveTo(x, plotTop);
+    ctx.lineTo(x, plotBottom);
+    ctx.fillText(String(ch), x, plotBottom + 6);
+  }
+  ctx.textAlign = "right";
+  ctx.textBaseline = "middle";
+  for (let rssi = RSSI_MIN; rssi <= RSSI_MAX; rssi += 10) {
+    const y = Math.round(scale.y(rssi)) + 0.5;
+    ctx.moveTo(plotLeft, y);
+    ctx.lineTo(plotLeft + plotWidth, y);
+    ctx.fillText(String(rssi), plotLeft - 8, y);
+  }
+  ctx.stroke();
+
+  ctx.strokeStyle = theme.axis;
+  ctx.beginPath();
+  ctx.moveTo(plotLeft, plotBottom + 0.5);
+  ctx.lineTo(plotLeft + plotWidth, plotBottom + 0.5);
+  ctx.stroke();
+
+  ctx.textAlign = "center";
+  ctx.textBaseline = "bottom";
+  ctx.fillText("channel", plotLeft + plotWidth / 2, plotBottom + 40);
+  ctx.save();
+  ctx.translate(14, plotTop + plotHeight / 2);
+  ctx.rotate(-Math.PI / 2);
+  ctx.textBaseline = "middle";
+  ctx.fillText("dBm", 0, 0);
+  ctx.restore();
+
+  ctx.font = "bold 14px ui-sans-serif, system-ui, sans-serif";
+  ctx.textAlign = "left";
+  ctx.textBaseline = "top";
+  ctx.fillText(title, 10, 8);
+}
+
+// Add one closed triangle (left base, apex, right base) to the current path.
+function traceTriangle(ctx, scale, data) {
+  const baseY = scale.y(RSSI_MIN);
+  ctx.moveTo(scale.x(data[0][0]), baseY);
+  ctx.lineTo(scale.x(data[1][0]), scale.y(data[1][1]));
+  ctx.lineTo(scale.x(data[2][0]), baseY);
+  ctx.closePath();
+}
+
+// Indices of the strongest series, used to pick which apexes get a label.
+function strongestIndices(series, limit) {
+  const order = [];
+  for (let i = 0; i < series.length; i++) {
+    if (series[i].data[1][1] > RSSI_MIN) order.push(i);
+  }
+  order.sort((a, b) => series[b].data[1][1] - series[a].data[1][1]);
+  return order.slice(0, limit);
+}
+
+// Draw a full frame for one band. `ctx` only needs the subset of the
+// CanvasRenderingContext2D API used below, which keeps this callable with a
+// recording stub from the benchmark.
+export function drawDensePlot(ctx, series, options) {
+  const { width, height, minChannel, maxChannel, title, dark, highlight = -1 } = options;
+  const theme = getDenseTheme(dark);
+  const scale = makeScale(width, height, minChannel, maxChannel);
+
+  ctx.clearRect(0, 0, width, height);
+  drawAxes(ctx, scale, theme, title);
+
+  ctx.save();
+  ctx.beginPath();
+  ctx.rect(scale.plotLeft, scale.plotTop, scale.plotWidth, scale.plotHeight);
+  ctx.clip();
+
+  // Batch by palette colour: one fill and one stroke per colour instead of
+  // one per series.
+  const dimmed = highlight >= 0;
+  ctx.lineWidth = 1;
+  for (let c = 0; c < PALETTE.length; c++) {
+    ctx.beginPath();
+    for (let i = c; i < series.length; i += PALETTE.length) {
+      if (i !== highlight) traceTriangle(ctx, scale, series[i].data);
+    }
+    ctx.fillStyle = PALETTE[c];
+    ctx.strokeStyle = PALETTE[c];
+    ctx.globalAlpha = dimmed ? 0.04 : theme.fillAlpha;
+    ctx.fill();
+    ctx.globalAlpha = dimmed ? 0.1 : 1;
+    ctx.stroke();
+  }
+  ctx.globalAlpha = 1;
+
+  if (highlight >= 0 && highlight < series.length) {
+    const color = seriesColor(highlight);
+    ctx.beginPath();
+    traceTriangle(ctx, scale, series[highlight].data);
+    ctx.fillStyle = color;
+    ctx.strokeStyle = color;
+    ctx.globalAlpha = 0.5;
+    ctx.fill();
+    ctx.globalAlpha = 1;
+    ctx.lineWidth = 2;
+    ctx.stroke();
+  }
+  ctx.restore();
+
+  ctx.font = "11px ui-sans-serif, system-ui, sans-serif";
+  ctx.textAlign = "center";
+  ctx.textBaseline = "bottom";
+  const labelled = highlight >= 0 ? [highlight] : strongestIndices(series, MAX_APEX_LABELS);
+  for (const i of labelled) {
+    if (i >= series.length) continue;
+    const s = series[i];
+    // Same rule as the ApexCharts data label formatter: no label at -100.
+    if (s.data[1][1] <= RSSI_MIN) continue;
+    const ch = s.data[1][0];
+    ctx.fillStyle = seriesColor(i);
+    ctx.fillText(`${ch} ${s.ssid === null ? "n/a" : s.ssid}`, scale.x(ch), scale.y(s.data[1][1]) - 3);
+  }
+}
+
+// Half-open [start, end) range of legend rows that intersect the viewport,
+// padded by `overscan` rows on each side.
+export function visibleLegendRange(scrollTop, viewportHeight, rowHeight, count, overscan = LEGEND_OVERSCAN) {
+  const first = Math.floor(scrollTop / rowHeight);
+  const last = Math.ceil((scrollTop + viewportHeight) / rowHeight);
+  return {
+    start: Math.max(0, first - overscan),
+    end: Math.min(count, last + overscan),
+  };
+}
+
+export function legendEntry(s) {
+  const ssid = s.ssid === null ? "n/a" : s.ssid;
+  return {
+    summary: `Channel: ${s.data[1][0]} RSSI: ${s.data[1][1]}dBm`,
+    ssid,
+    missing: s.ssid === null,
+    bssid: s.name,
+  };
+}
+
+function csvField(value) {
+  const text = value === null ? "" : String(value);
+  return /[",\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+// CSV for the dense view's export button. The first two columns use the same
+// headers as the ApexCharts CSV export (toolbar.export.csv); ssid and bssid
+// follow so rows from different networks can be told apart.
+export function seriesToCsv(series, delimiter = ",") {
+  const lines = [["channel", "rssi", "ssid", "bssid"].join(delimiter)];
+  for (const s of series) {
+    lines.push([s.data[1][0], s.data[1][1], csvField(s.ssid), csvField(s.name)].join(delimiter));
+  }
+  return lines.join("\n") + "\n";
+}
+
+function downloadBlob(blob, filename) {
+  const url = URL.createObjectURL(blob);
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = filename;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
+}
+
+// Coalesce calls to `schedule(key, value)` so that `flush(pending)` runs at
+// most once per animation frame with the latest value for each key. Updates
+// that arrive while a frame is already queued just overwrite the pending
+// value.
+export function createFrameScheduler(flush, requestFrame) {
+  const raf = requestFrame || ((cb) => requestAnimationFrame(cb));
+  let pending = new Map();
+  let queued = false;
+
+  const run = () => {
+    queued = false;
+    const batch = pending;
+    pending = new Map();
+    flush(batch);
+  };
+
+  return {
+    schedule(key, value) {
+      pending.set(key, value);
+      if (!queued) {
+        queued = true;
+        raf(run);
+      }
+    },
+    get pendingCount() {
+      return pending.size;
+    },
+  };
+}
+
+// DOM-backed dense chart for a single band: a canvas plot plus a
+// virtualised legend, mounted next to the ApexCharts element it replaces.
+// It has its own small toolbar (expand, PNG, CSV) because the ApexCharts
+// toolbar is hidden together with the chart.
+export class DenseChart {
+  constructor(container, { title, minChannel, maxChannel, isDark, expandIcon }) {
+    this.container = container;
+    this.title = title;
+    this.minChannel = minChannel;
+    this.maxChannel = maxChannel;
+    this.isDark = isDark;
+    this.series = [];
+    this.highlight = -1;
+    this.renderedRange = { start: 0, end: 0 };
+    this.dirty = { plot: false, legend: false };
+    this.frame = createFrameScheduler(() => this.paint());
+
+    this.root = document.createElement("div");
+    this.root.className = "dense-chart";
+    this.root.style.display = "none";
+
+    this.legend = document.createElement("div");
+    this.legend.className = "dense-legend";
+    this.legendSpacer = document.createElement("div");
+    this.legendSpacer.className = "dense-legend-spacer";
+    this.legendRows = document.createElement("div");
+    this.legendRows.className = "dense-legend-rows";
+    this.legend.appendChild(this.legendSpacer);
+    this.legend.appendChild(this.legendRows);
+
+    this.plot = document.createElement("div");
+    this.plot.className = "dense-plot";
+    this.canvas = document.createElement("canvas");
+    this.plot.appendChild(this.canvas);
+
+    this.toolbar = document.createElement("div");
+    this.toolbar.className = "dense-toolbar";
+    this.toolbar.append(
+      this.makeToolbarButton(expandIcon, "Toggle Expand", () => this.toggleFullWindow()),
+      this.makeToolbarButton("PNG", "Download PNG", () => this.exportPng()),
+      this.makeToolbarButton("CSV", "Download CSV", () => this.exportCsv()),
+    );
+    this.plot.appendChild(this.toolbar);
+
+    this.root.appendChild(this.legend);
+    this.root.appendChild(this.plot);
+    container.appendChild(this.root);
+
+    this.legend.addEventListener("scroll", () => this.invalidate({ legend: true }), { passive: true });
+    this.legendRows.addEventListener("mouseover", (e) => {
+      const row = e.target.closest(".dense-legend-row");
+      if (row) this.setHighlight(Number(row.dataset.index));
+    });
+    this.legend.addEventListener("mouseleave", () => this.setHighlight(-1));
+
+    this.resizeObserver = new ResizeObserver(() => this.invalidate({ plot: true, legend: true }));
+    this.resizeObserver.observe(this.plot);
+  }
+
+  makeToolbarButton(content, title, onClick) {
+    const button = document.createElement("button");
+    button.type = "button";
+    button.title = title;
+    button.innerHTML = content;
+    button.addEventListener("click", onClick);
+    return button;
+  }
+
+  get fullWindow() {
+    return this.container.classList.contains("full-window");
+  }
+
+  // Same classes the ApexCharts "Toggle Expand" icon uses, so either
+  // renderer can leave a full-window state entered by the other.
+  toggleFullWindow() {
+    const expand = !this.fullWindow;
+    const bandControls = document.getElementById("band-controls");
+    this.container.classList.toggle("full-window", expand);
+    document.body.classList.toggle("noscroll", expand);
+    if (bandControls) bandControls.style.display = expand ? "none" : "flex";
+    this.invalidate({ plot: true, legend: true });
+  }
+
+  exportPng() {
+    this.canvas.toBlob((blob) => {
+      if (blob) downloadBlob(blob, "export.png");
+    }, "image/png");
+  }
+
+  exportCsv() {
+    downloadBlob(new Blob([seriesToCsv(this.series)], { type: "text/csv" }), "export.csv");
+  }
+
+  get visible() {
+    return this.root.style.display !== "none";
+  }
+
+  // Callers are expected to paint() right after show()/setSeries(), so these
+  // only mark the chart dirty instead of queueing another frame.
+  show() {
+    this.root.style.display = "flex";
+    this.markDirty({ plot: true, legend: true });
+  }
+
+  hide() {
+    this.root.style.display = "none";
+  }
+
+  setSeries(series) {
+    this.series = series;
+    if (this.highlight >= series.length) this.highlight = -1;
+    this.legendSpacer.style.height = `${series.length * LEGEND_ROW_HEIGHT}px`;
+    // Row contents change every tick, so force the visible window to rebuild.
+    this.renderedRange = { start: 0, end: 0 };
+    this.markDirty({ plot: true, legend: true });
+  }
+
+  setHighlight(index) {
+    if (index === this.highlight) return;
+    this.highlight = index;
+    this.invalidate({ plot: true });
+  }
+
+  markDirty({ plot = false, legend = false }) {
+    this.dirty.plot = this.dirty.plot || plot;
+    this.dirty.legend = this.dirty.legend || legend;
+  }
+
+  invalidate(dirty) {
+    this.markDirty(dirty);
+    if (this.visible) this.frame.schedule("paint", true);
+  }
+
+  paint() {
+    if (!this.visible) return;
+    if (this.dirty.plot) this.paintPlot();
+    if (this.dirty.legend) this.paintLegend();
+    this.dirty = { plot: false, legend: false };
+  }
+
+  paintPlot() {
+    const width = this.plot.clientWidth;
+    let height;
+    if (this.fullWindow) {
+      const style = getComputedStyle(this.container);
+      height = this.container.clientHeight - parseFloat(style.paddingTop) - parseFloat(style.paddingBottom);
+    } else {
+      // Roughly the aspect ratio ApexCharts picks for height: "auto".
+      height = Math.min(800, Math.max(300, width / 1.8));
+    }
+    height = Math.max(1, Math.round(height));
+    const ratio = window.devicePixelRatio || 1;
+    if (this.canvas.width !== Math.round(width * ratio) || this.canvas.height !== Math.round(height * ratio)) {
+      this.canvas.width = Math.round(width * ratio);
+      this.canvas.height = Math.round(height * ratio);
+      this.canvas.style.width = `${width}px`;
+      this.canvas.style.height = `${height}px`;
+      this.legend.style.height = `${height}px`;
+    }
+    const ctx = this.canvas.getContext("2d");
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    drawDensePlot(ctx, this.series, {
+      width,
+      height,
+      minChannel: this.minChannel,
+      maxChannel: this.maxChannel,
+      title: this.title,
+      dark: this.isDark(),
+      highlight: this.highlight,
+    });
+  }
+
+  paintLegend() {
+    const range = visibleLegendRange(
+      this.legend.scrollTop,
+      this.legend.clientHeight,
+      LEGEND_ROW_HEIGHT,
+      this.series.length,
+    );
+    if (range.start === this.renderedRange.start && range.end === this.renderedRange.end) return;
+    this.renderedRange = range;
+
+    const fragment = document.createDocumentFragment();
+    for (let i = range.start; i < range.end; i++) {
+      const entry = legendEntry(this.series[i]);
+      const row = document.createElement("div");
+      row.className = "dense-legend-row";
+      row.dataset.index = String(i);
+      row.style.top = `${i * LEGEND_ROW_HEIGHT}px`;
+      row.style.height = `${LEGEND_ROW_HEIGHT}px`;
+
+      const marker = document.createElement("span");
+      marker.className = "dense-legend-marker";
+      marker.style.background = seriesColor(i);
+
+      const text = document.createElement("span");
+      const summary = document.createElement("span");
+      summary.textContent = entry.summary;
+      const ssid = document.createElement("b");
+      ssid.textContent = entry.ssid;
+      if (entry.missing) ssid.style.color = "#888";
+      const bssid = document.createElement("span");
+      bssid.className = "dense-legend-bssid";
+      bssid.textContent = entry.bssid;
+      text.append(summary, document.createElement("br"), ssid, document.createElement("br"), bssid);
+
+      row.append(marker, text);
+      fragment.appendChild(row);
+    }
+    this.legendRows.replaceChildren(fragment);
+  }
+}
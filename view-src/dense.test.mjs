@@ -0,0 +1,112 @@
+import assert from "node:assert/strict";
+import { test } from "node:test";
+
+import {
+  DENSE_SERIES_THRESHOLD,
+  createFrameScheduler,
+  drawDensePlot,
+  legendEntry,
+  seriesToCsv,
+  shouldUseDense,
+  visibleLegendRange,
+} from "./dense.mjs";
+
+function makeSeries(name, ssid, left, center, right, rssi) {
+  return { name, ssid, data: [[left, -100], [center, rssi], [right, -100]] };
+}
+
+function makeStubContext() {
+  const texts = [];
+  const ctx = new Proxy(
+    { texts },
+    {
+      get(target, prop) {
+        if (prop in target) return target[prop];
+        if (prop === "fillText") return (text) => texts.push(text);
+        return () => {};
+      },
+      set(target, prop, value) {
+        target[prop] = value;
+        return true;
+      },
+    },
+  );
+  return ctx;
+}
+
+test("shouldUseDense switches on above the threshold", () => {
+  assert.equal(DENSE_SERIES_THRESHOLD, 150);
+  assert.equal(shouldUseDense(150, false), false);
+  assert.equal(shouldUseDense(151, false), true);
+});
+
+test("shouldUseDense stays on until the count drops below the hysteresis", () => {
+  assert.equal(shouldUseDense(150, true), true);
+  assert.equal(shouldUseDense(120, true), true);
+  assert.equal(shouldUseDense(119, true), false);
+});
+
+test("visibleLegendRange pads by overscan and clamps to [0, count)", () => {
+  assert.deepEqual(visibleLegendRange(0, 100, 10, 50, 4), { start: 0, end: 14 });
+  assert.deepEqual(visibleLegendRange(200, 100, 10, 50, 4), { start: 16, end: 34 });
+  assert.deepEqual(visibleLegendRange(450, 100, 10, 50, 4), { start: 41, end: 50 });
+  assert.deepEqual(visibleLegendRange(0, 100, 10, 3, 4), { start: 0, end: 3 });
+});
+
+test("legendEntry formats missing SSIDs as n/a", () => {
+  const entry = legendEntry(makeSeries("aa:bb", null, 4, 6, 8, -50));
+  assert.equal(entry.summary, "Channel: 6 RSSI: -50dBm");
+  assert.equal(entry.ssid, "n/a");
+  assert.equal(entry.missing, true);
+  assert.equal(entry.bssid, "aa:bb");
+});
+
+test("frame scheduler flushes once per frame with the latest value per key", () => {
+  const frames = [];
+  const flushes = [];
+  const scheduler = createFrameScheduler(
+    (pending) => flushes.push(new Map(pending)),
+    (cb) => frames.push(cb),
+  );
+
+  scheduler.schedule("5", "a");
+  scheduler.schedule("5", "b");
+  scheduler.schedule("24", "x");
+  scheduler.schedule("5", "c");
+  assert.equal(frames.length, 1);
+  assert.equal(flushes.length, 0);
+
+  frames.shift()();
+  assert.equal(flushes.length, 1);
+  assert.deepEqual([...flushes[0]], [["5", "c"], ["24", "x"]]);
+  assert.equal(scheduler.pendingCount, 0);
+
+  scheduler.schedule("5", "d");
+  assert.equal(frames.length, 1);
+  frames.shift()();
+  assert.deepEqual([...flushes[1]], [["5", "d"]]);
+});
+
+test("seriesToCsv writes one row per network and quotes SSIDs", () => {
+  const csv = seriesToCsv([
+    makeSeries("aa:bb", "Cafe, \"Guest\"", 4, 6, 8, -50),
+    makeSeries("cc:dd", null, 34, 36, 38, -70),
+  ]);
+  assert.equal(
+    csv,
+    'channel,rssi,ssid,bssid\n6,-50,"Cafe, ""Guest""",aa:bb\n36,-70,,cc:dd\n',
+  );
+});
+
+test("drawDensePlot does not label a highlighted series at -100 dBm", () => {
+  const options = { width: 800, height: 400, minChannel: 1, maxChannel: 16, title: "2.4GHz", dark: false };
+  const series = [makeSeries("aa:bb", "Strong", 4, 6, 8, -40), makeSeries("cc:dd", "Gone", 9, 11, 13, -100)];
+
+  const ctx = makeStubContext();
+  drawDensePlot(ctx, series, { ...options, highlight: 1 });
+  assert.ok(!ctx.texts.includes("11 Gone"));
+
+  const highlighted = makeStubContext();
+  drawDensePlot(highlighted, series, { ...options, highlight: 0 });
+  assert.ok(highlighted.texts.includes("6 Strong"));
+});